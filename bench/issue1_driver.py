@@ -0,0 +1,272 @@
+"""Shared driver for the issue #1 benchmark matrix scripts.
+
+Rows are measured in-process through the `bench_run` export of the bench
+shared library when it is available, and by spawning the bench binary
+otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import functools
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json with compact separators
+    orjson = None
+
+
+class BenchResult(ctypes.Structure):
+    # Must match `BenchResult` in bench/optimize-bench.zig.
+    _fields_ = [
+        ("status", ctypes.c_int),
+        ("transducer_len", ctypes.c_uint64),
+        ("branches", ctypes.c_uint64),
+        ("total_ns", ctypes.c_uint64),
+        ("avg_ns", ctypes.c_uint64),
+        ("min_ns", ctypes.c_uint64),
+        ("max_ns", ctypes.c_uint64),
+        ("avg_states", ctypes.c_uint64),
+    ]
+
+
+TABLE_HEADER = (
+    "| scenario | len | transducer_len | branches | avg_us | min_us | max_us | avg_states |\n"
+    "|---|---:|---:|---:|---:|---:|---:|---:|\n"
+)
+
+
+def format_row(row: dict) -> str:
+    """Render one result row as a markdown table line."""
+    return (
+        f"| {row['scenario']} | {row['len']} | {row['transducer_len']} | {row['branches']} | "
+        f"{row['avg_ns'] / 1000.0:.3f} | {row['min_ns'] / 1000.0:.3f} | "
+        f"{row['max_ns'] / 1000.0:.3f} | {row['avg_states']} |\n"
+    )
+
+
+class OrderedRowWriter:
+    """Stream markdown rows in matrix order while scenarios finish out of order.
+
+    Workers call `put(scenario_idx, row)` with each scenario's rows in length
+    order. Rows that arrive ahead of the next expected one are buffered;
+    every contiguous run that becomes ready is flushed with one write.
+    """
+
+    def __init__(self, num_lengths: int) -> None:
+        self._num_lengths = num_lengths
+        self._lock = threading.Lock()
+        self._seen: dict[int, int] = {}
+        self._pending: dict[int, dict] = {}
+        self._next = 0
+
+    def put(self, scenario_idx: int, row: dict) -> None:
+        with self._lock:
+            length_idx = self._seen.get(scenario_idx, 0)
+            self._seen[scenario_idx] = length_idx + 1
+            self._pending[scenario_idx * self._num_lengths + length_idx] = row
+            ready = []
+            while self._next in self._pending:
+                ready.append(format_row(self._pending.pop(self._next)))
+                self._next += 1
+            if ready:
+                sys.stdout.write("".join(ready))
+                sys.stdout.flush()
+
+
+def dumps_row(row: dict) -> str:
+    """Serialize one result row as compact ASCII JSON for the JSONL section."""
+    if orjson is not None:
+        # Rows only hold numbers and bench scenario names, which are ASCII.
+        return orjson.dumps(row).decode("ascii")
+    return json.dumps(row, ensure_ascii=True, separators=(",", ":"))
+
+
+def parse_lengths(text: str) -> list[int]:
+    """argparse type for --lengths: comma-separated positive integers."""
+    try:
+        lengths = [int(x) for x in text.split(",") if x.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+    if not lengths or any(length <= 0 for length in lengths):
+        raise argparse.ArgumentTypeError(f"expected positive comma-separated lengths, got {text!r}")
+    return lengths
+
+
+def parse_names(text: str) -> list[str]:
+    """argparse type for --scenarios: comma-separated, non-empty names."""
+    names = [x.strip() for x in text.split(",") if x.strip()]
+    if not names:
+        raise argparse.ArgumentTypeError("expected at least one scenario")
+    return names
+
+
+def add_matrix_args(p: argparse.ArgumentParser) -> None:
+    """Add the options every matrix script shares; scripts add their own defaults."""
+    p.add_argument("--optimize", default="ReleaseFast", help="zig -Doptimize mode.")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Scenarios measured concurrently (default: half the CPUs; 1 for quietest timings).",
+    )
+    p.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Spawn the bench binary per scenario instead of calling the bench library in-process.",
+    )
+
+
+def build_bench(repo: Path, optimize: str) -> Path:
+    # Build once and exec the installed binary directly: `zig build bench` would
+    # re-walk the build graph and take the cache lock for every invocation.
+    subprocess.check_call(["zig", "build", f"-Doptimize={optimize}"], cwd=repo)
+    return repo / "zig-out" / "bin" / "optimize-bench"
+
+
+def load_bench_lib(repo: Path, optimize: str) -> ctypes.CDLL | None:
+    """Build and load the bench shared library.
+
+    Returns None, with a note on stderr, when the library cannot be built or
+    loaded, so callers fall back to spawning the bench binary.
+    """
+    try:
+        subprocess.check_call(["zig", "build", "bench-lib", f"-Doptimize={optimize}"], cwd=repo)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"note: bench-lib build failed ({e}); spawning the bench binary instead", file=sys.stderr)
+        return None
+    name = "liboptimize-bench.dylib" if sys.platform == "darwin" else "liboptimize-bench.so"
+    path = repo / "zig-out" / "lib" / name
+    try:
+        lib = ctypes.CDLL(str(path))
+    except OSError as e:
+        print(f"note: cannot load {path} ({e}); spawning the bench binary instead", file=sys.stderr)
+        return None
+    lib.bench_run.argtypes = [ctypes.c_char_p] + [ctypes.c_uint64] * 5
+    lib.bench_run.restype = BenchResult
+    return lib
+
+
+def common_bench_args(lengths: list[int], args: argparse.Namespace) -> list[str]:
+    """CLI arguments shared by every scenario's bench invocation."""
+    return [
+        "--lens",
+        ",".join(str(length) for length in lengths),
+        "--transducer-len",
+        str(args.transducer_len),
+        "--branches",
+        str(args.branches),
+        "--iters",
+        str(args.iters),
+        "--warmup",
+        str(args.warmup),
+        "--format",
+        "json",
+    ]
+
+
+def run_scenario(
+    bench: Path, scenario: str, common: list[str], on_row: Callable[[dict], None] | None = None
+) -> list[dict]:
+    # One child per scenario: the bench binary loops over --lens and prints a
+    # JSON line per length, so process startup is not paid for every row.
+    cmd = [str(bench), "--scenario", scenario, *common]
+    rows = []
+    # json.loads takes bytes directly, so skip the text-mode decode layer.
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        for line in proc.stdout:
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    # The bench prints usage text to stdout on bad arguments;
+                    # report its exit status rather than the decode error.
+                    output = line + proc.stdout.read()
+                    if proc.wait() != 0:
+                        raise subprocess.CalledProcessError(proc.returncode, cmd, output=output) from e
+                    raise
+                rows.append(row)
+                if on_row is not None:
+                    on_row(row)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return rows
+
+
+def run_scenario_in_process(
+    lib: ctypes.CDLL,
+    scenario: str,
+    lengths: list[int],
+    args: argparse.Namespace,
+    on_row: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    # ctypes drops the GIL for the duration of each call, so a thread pool
+    # still runs scenarios concurrently.
+    rows = []
+    name = scenario.encode("ascii")
+    for length in lengths:
+        res = lib.bench_run(
+            name,
+            length,
+            args.transducer_len,
+            args.branches,
+            args.iters,
+            args.warmup,
+        )
+        if res.status != 0:
+            raise RuntimeError(f"bench_run failed: scenario={scenario} len={length} status={res.status}")
+        row = {
+            "scenario": scenario,
+            "len": length,
+            "transducer_len": res.transducer_len,
+            "branches": res.branches,
+            "warmup": args.warmup,
+            "iters": args.iters,
+            "total_ns": res.total_ns,
+            "avg_ns": res.avg_ns,
+            "min_ns": res.min_ns,
+            "max_ns": res.max_ns,
+            "avg_states": res.avg_states,
+        }
+        rows.append(row)
+        if on_row is not None:
+            on_row(row)
+    return rows
+
+
+def run_matrix(repo: Path, scenarios: Sequence[str], lengths: list[int], args: argparse.Namespace) -> None:
+    """Measure every (scenario, length) pair and print the markdown table and JSONL."""
+    bench = build_bench(repo, args.optimize)
+    lib = None if args.subprocess else load_bench_lib(repo, args.optimize)
+    common = common_bench_args(lengths, args)
+
+    # Rows stream out as they arrive; the writer holds back early finishers so
+    # the table keeps scenario/length order.
+    sys.stdout.write(TABLE_HEADER)
+    sys.stdout.flush()
+    writer = OrderedRowWriter(len(lengths))
+
+    def run(indexed: tuple[int, str]) -> list[dict]:
+        idx, scenario = indexed
+        on_row = functools.partial(writer.put, idx)
+        if lib is not None:
+            return run_scenario_in_process(lib, scenario, lengths, args, on_row)
+        return run_scenario(bench, scenario, common, on_row)
+
+    # Scenarios are independent; map() keeps the JSONL order.
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        batches = pool.map(run, enumerate(scenarios))
+        rows = [row for batch in batches for row in batch]
+
+    lines = ["", "# jsonl"]
+    lines.extend(dumps_row(row) for row in rows)
+    sys.stdout.write("\n".join(lines) + "\n")
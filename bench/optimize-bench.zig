@@ -35,6 +35,7 @@ const OutputFormat = enum {
 const Options = struct {
     scenario: Scenario = .optimize_acceptor,
     len: usize = 4096,
+    lens: []const usize = &.{}, // non-empty => run every length in one process
     transducer_len: usize = 0, // 0 => derive from len
     branches: usize = 3,
     iterations: usize = 80,
@@ -106,6 +107,7 @@ fn printUsage(out: *std.Io.Writer) !void {
         \\Usage: optimize-bench [options]
         \\  --scenario <name>         clone_acceptor|optimize_acceptor|optimize_transducer|compose_acceptor|compose_frozen_transducer|compose_frozen_epsilon_dense|compose_frozen_ambiguous_chain|compose_frozen_shortest_path|compose_frozen_shortest_path_ambiguous|compose_frozen_shortest_path_epsilon_dense|compose_frozen_lazy_shortest_path|compose_frozen_lazy_shortest_path_ambiguous|compose_frozen_lazy_shortest_path_epsilon_dense|rm_epsilon_acceptor|shortest_path_acceptor
         \\  --len <n>                 graph length (default: 4096)
+        \\  --lens <n,n,...>          run several lengths in one process, one result per line
         \\  --transducer-len <n>      transducer length (default: len/4, min 1)
         \\  --branches <n>            branching factor for transducer (default: 3)
         \\  --iters <n>               timed iterations (default: 80)
@@ -120,7 +122,19 @@ fn printUsage(out: *std.Io.Writer) !void {
     );
 }
 
-fn parseOptions(args: []const [:0]const u8) !Options {
+fn parseLengths(allocator: Allocator, arg: []const u8) ![]const usize {
+    var lens: std.ArrayList(usize) = .empty;
+    var it = std.mem.tokenizeScalar(u8, arg, ',');
+    while (it.next()) |tok| {
+        const len = try std.fmt.parseInt(usize, std.mem.trim(u8, tok, " "), 10);
+        if (len == 0) return error.InvalidArgument;
+        try lens.append(allocator, len);
+    }
+    if (lens.items.len == 0) return error.InvalidArgument;
+    return lens.toOwnedSlice(allocator);
+}
+
+fn parseOptions(allocator: Allocator, args: []const [:0]const u8) !Options {
     var opts = Options{};
     var i: usize = 1;
     while (i < args.len) {
@@ -135,6 +149,8 @@ fn parseOptions(args: []const [:0]const u8) !Options {
             opts.scenario = parseScenario(value) orelse return error.InvalidArgument;
         } else if (std.mem.eql(u8, arg, "--len")) {
             opts.len = try std.fmt.parseInt(usize, value, 10);
+        } else if (std.mem.eql(u8, arg, "--lens")) {
+            opts.lens = try parseLengths(allocator, value);
         } else if (std.mem.eql(u8, arg, "--transducer-len")) {
             opts.transducer_len = try std.fmt.parseInt(usize, value, 10);
         } else if (std.mem.eql(u8, arg, "--branches")) {
@@ -475,13 +491,14 @@ fn scenarioName(scenario: Scenario) []const u8 {
 pub fn main(init: std.process.Init) !void {
     const allocator = init.gpa;
     const io = init.io;
-    const args = try init.minimal.args.toSlice(init.arena.allocator());
+    const arena = init.arena.allocator();
+    const args = try init.minimal.args.toSlice(arena);
 
     var out_buf: [4096]u8 = undefined;
     var stdout_writer = std.Io.File.stdout().writer(io, &out_buf);
     const out = &stdout_writer.interface;
 
-    const opts = parseOptions(args) catch |err| switch (err) {
+    const opts = parseOptions(arena, args) catch |err| switch (err) {
         error.ShowUsage => {
             try printUsage(out);
             try out.flush();
@@ -495,11 +512,37 @@ pub fn main(init: std.process.Init) !void {
         },
     };
 
+    // Lengths run back to back in this process, so loader/runtime startup is
+    // paid once; each length still gets its own inputs and warmup because the
+    // graphs differ in size. Flush per length so callers can stream rows.
+    const single = [_]usize{opts.len};
+    const lens: []const usize = if (opts.lens.len > 0) opts.lens else &single;
+    for (lens) |len| {
+        var len_opts = opts;
+        len_opts.len = len;
+        try runLength(out, io, allocator, len_opts);
+        try out.flush();
+    }
+}
+
+const Measurement = struct {
+    transducer_len: usize,
+    stats: BenchStats,
+};
+
+fn measure(out: *std.Io.Writer, io: std.Io, allocator: Allocator, opts: Options) !Measurement {
     const transducer_len = @max(@as(usize, 1), if (opts.transducer_len == 0) opts.len / 4 else opts.transducer_len);
     var inputs = try initInputs(allocator, opts.len, transducer_len, opts.branches);
     defer inputs.deinit();
 
     const stats = try benchmark(out, io, allocator, opts, &inputs);
+    return .{ .transducer_len = transducer_len, .stats = stats };
+}
+
+fn runLength(out: *std.Io.Writer, io: std.Io, allocator: Allocator, opts: Options) !void {
+    const m = try measure(out, io, allocator, opts);
+    const transducer_len = m.transducer_len;
+    const stats = m.stats;
     const avg_ns = stats.total_ns / opts.iterations;
     const avg_us = @as(f64, @floatFromInt(avg_ns)) / @as(f64, std.time.ns_per_us);
     const avg_states = stats.total_states / opts.iterations;
@@ -541,5 +584,61 @@ pub fn main(init: std.process.Init) !void {
             );
         },
     }
-    try out.flush();
+}
+
+/// C ABI result of `bench_run`; fields mirror the JSON output.
+/// status: 0 ok, 1 invalid argument, 2 benchmark failed.
+pub const BenchResult = extern struct {
+    status: c_int,
+    transducer_len: u64,
+    branches: u64,
+    total_ns: u64,
+    avg_ns: u64,
+    min_ns: u64,
+    max_ns: u64,
+    avg_states: u64,
+};
+
+/// In-process entry point for drivers that load the benchmark as a shared
+/// library (`zig build bench-lib`) instead of spawning a process per run.
+export fn bench_run(
+    scenario_name: ?[*:0]const u8,
+    len: u64,
+    transducer_len: u64,
+    branches: u64,
+    iters: u64,
+    warmup: u64,
+) callconv(.c) BenchResult {
+    var result = std.mem.zeroes(BenchResult);
+    result.status = 1;
+    const name = scenario_name orelse return result;
+    const scenario = parseScenario(std.mem.span(name)) orelse return result;
+    if (len == 0 or iters == 0) return result;
+
+    const opts = Options{
+        .scenario = scenario,
+        .len = @intCast(len),
+        .transducer_len = @intCast(transducer_len),
+        .branches = @max(@as(usize, 1), @as(usize, @intCast(branches))),
+        .iterations = @intCast(iters),
+        .warmup = @intCast(warmup),
+    };
+    // per_iter is off, so the benchmark never writes to this sink. The C ABI
+    // has no `std.process.Init`, so use the same fallback I/O as c-api.zig.
+    var sink: std.Io.Writer = .failing;
+    const io = std.Io.Threaded.global_single_threaded.io();
+    const m = measure(&sink, io, std.heap.smp_allocator, opts) catch {
+        result.status = 2;
+        return result;
+    };
+
+    result.status = 0;
+    result.transducer_len = m.transducer_len;
+    result.branches = opts.branches;
+    result.total_ns = m.stats.total_ns;
+    result.avg_ns = m.stats.total_ns / opts.iterations;
+    result.min_ns = m.stats.min_ns;
+    result.max_ns = m.stats.max_ns;
+    result.avg_states = m.stats.total_states / opts.iterations;
+    return result;
 }
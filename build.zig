@@ -115,8 +115,11 @@ pub fn build(b: *std.Build) void {
     });
     b.installArtifact(att2lfst_exe);
 
+    // Install as well as compile: the WeText converter scripts run the tool
+    // from zig-out/bin/att2lfst.
+    const install_att2lfst = b.addInstallArtifact(att2lfst_exe, .{});
     const att2lfst_step = b.step("att2lfst", "Build att2lfst converter tool");
-    att2lfst_step.dependOn(&att2lfst_exe.step);
+    att2lfst_step.dependOn(&install_att2lfst.step);
 
     const bench_module = b.createModule(.{
         .root_source_file = b.path("bench/optimize-bench.zig"),
@@ -137,4 +140,22 @@ pub fn build(b: *std.Build) void {
     }
     const bench_step = b.step("bench", "Run profile-friendly FST benchmarks");
     bench_step.dependOn(&run_bench.step);
+
+    // Same benchmark as a shared library so drivers can call `bench_run`
+    // in-process. Kept out of the default install step.
+    const bench_lib_module = b.createModule(.{
+        .root_source_file = b.path("bench/optimize-bench.zig"),
+        .target = target,
+        .optimize = optimize,
+    });
+    bench_lib_module.addImport("libfst", root_module);
+
+    const bench_lib = b.addLibrary(.{
+        .linkage = .dynamic,
+        .name = "optimize-bench",
+        .root_module = bench_lib_module,
+    });
+    const install_bench_lib = b.addInstallArtifact(bench_lib, .{});
+    const bench_lib_step = b.step("bench-lib", "Build the benchmark as a shared library for in-process drivers");
+    bench_lib_step.dependOn(&install_bench_lib.step);
 }
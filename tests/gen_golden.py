@@ -7,12 +7,18 @@ Each test case generates:
   tests/corpus/{test_name}.input.att   — input FST(s)
   tests/corpus/{test_name}.golden.att  — expected output FST
 
+Generators whose outputs already exist and are newer than this script are
+skipped; pass --force to regenerate everything.
+
 Usage:
-  python tests/gen_golden.py
+  python tests/gen_golden.py [--force]
 """
 
+import argparse
+import functools
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 try:
     import pynini
@@ -38,14 +44,27 @@ def write_text(fst, path):
         f.write("\n")
 
 
-def make_sigma_star(labels=range(1, 128)):
-    """Build sigma* over the given label range."""
-    syms = pynini.SymbolTable()
-    syms.add_symbol("<eps>", 0)
+# Alphabet shared by the cdrewrite cases.
+LOWERCASE = tuple(range(ord("a"), ord("z") + 1))
+
+
+@functools.lru_cache(maxsize=None)
+def make_sigma_star(labels=tuple(range(1, 128))):
+    """Build sigma* over the given labels (a tuple, so results can be cached).
+
+    pynini operations do not mutate their arguments, so callers can share
+    the cached FST.
+    """
+    # One start state with an arc per label, rather than a union of
+    # single-symbol acceptors. Labels are byte values, as pynini.accep uses.
+    sigma = pynini.Fst()
+    s0 = sigma.add_state()
+    s1 = sigma.add_state()
+    sigma.set_start(s0)
+    sigma.set_final(s1)
     for l in labels:
-        syms.add_symbol(chr(l), l)
-    sigma = pynini.union(*[pynini.accep(chr(l)) for l in labels])
-    return pynini.closure(sigma)
+        sigma.add_arc(s0, pynini.Arc(l, l, 0, s1))
+    return pynini.closure(sigma).optimize()
 
 
 # ── Test case generators ──
@@ -128,7 +147,7 @@ def gen_project():
 
 def gen_cdrewrite():
     """cdrewrite: a -> b / everywhere"""
-    sigma_star = make_sigma_star(range(ord("a"), ord("z") + 1))
+    sigma_star = make_sigma_star(LOWERCASE)
     tau = pynini.cross("a", "b")
     # Empty contexts
     lambda_ctx = pynini.accep("")
@@ -141,7 +160,7 @@ def gen_cdrewrite():
 
 def gen_cdrewrite_context():
     """cdrewrite: a -> b / c _ d"""
-    sigma_star = make_sigma_star(range(ord("a"), ord("z") + 1))
+    sigma_star = make_sigma_star(LOWERCASE)
     tau = pynini.cross("a", "b")
     lambda_ctx = pynini.accep("c")
     rho_ctx = pynini.accep("d")
@@ -151,6 +170,12 @@ def gen_cdrewrite_context():
     write_text(result, os.path.join(CORPUS_DIR, "cdrewrite_context.golden.att"))
 
 
+def gen_cdrewrite_all():
+    """Both cdrewrite cases in one pool task so they share the cached sigma*."""
+    gen_cdrewrite()
+    gen_cdrewrite_context()
+
+
 def gen_shortest_path():
     """shortest_path: find n-best paths"""
     fst = pynini.union(
@@ -202,29 +227,72 @@ def gen_optimize():
 # ── Main ──
 
 GENERATORS = [
-    ("compose", gen_compose),
-    ("determinize", gen_determinize),
-    ("union", gen_union),
-    ("concat", gen_concat),
-    ("closure", gen_closure),
-    ("invert", gen_invert),
-    ("project", gen_project),
-    ("cdrewrite_simple", gen_cdrewrite),
-    ("cdrewrite_context", gen_cdrewrite_context),
-    ("shortest_path", gen_shortest_path),
-    ("difference", gen_difference),
-    ("optimize", gen_optimize),
+    ("compose", gen_compose, ["compose.input1.att", "compose.input2.att", "compose.golden.att"]),
+    ("determinize", gen_determinize, ["determinize.input.att", "determinize.golden.att"]),
+    ("union", gen_union, ["union.input1.att", "union.input2.att", "union.golden.att"]),
+    ("concat", gen_concat, ["concat.input1.att", "concat.input2.att", "concat.golden.att"]),
+    ("closure", gen_closure, ["closure_star.input.att", "closure_star.golden.att"]),
+    ("invert", gen_invert, ["invert.input.att", "invert.golden.att"]),
+    ("project", gen_project, ["project.input.att", "project_input.golden.att", "project_output.golden.att"]),
+    ("cdrewrite", gen_cdrewrite_all, ["cdrewrite_simple.golden.att", "cdrewrite_context.golden.att"]),
+    ("shortest_path", gen_shortest_path, ["shortest_path.input.att", "shortest_path.golden.att"]),
+    ("difference", gen_difference, ["difference.input1.att", "difference.input2.att", "difference.golden.att"]),
+    ("optimize", gen_optimize, ["optimize.input.att", "optimize.golden.att"]),
 ]
 
 
+def is_up_to_date(outputs, script_mtime):
+    """True when every output exists and is at least as new as this script."""
+    for name in outputs:
+        path = os.path.join(CORPUS_DIR, name)
+        if not os.path.exists(path) or os.path.getmtime(path) < script_mtime:
+            return False
+    return True
+
+
+def select_generators(script_mtime, force):
+    """Return the generators that need to run, reporting the skipped ones."""
+    pending = []
+    for name, gen_fn, outputs in GENERATORS:
+        if not force and is_up_to_date(outputs, script_mtime):
+            print(f"  - {name} (up-to-date)")
+        else:
+            pending.append((name, gen_fn))
+    return pending
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate Pynini golden outputs for diff tests.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every case even if its outputs are up-to-date.",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    script_mtime = os.path.getmtime(__file__)
     print(f"Generating golden outputs in {CORPUS_DIR}/")
-    for name, gen_fn in GENERATORS:
-        try:
-            gen_fn()
-            print(f"  ✓ {name}")
-        except Exception as e:
-            print(f"  ✗ {name}: {e}", file=sys.stderr)
+    pending = select_generators(script_mtime, args.force)
+    if pending:
+        # Every generator writes its own corpus files, so they can run side by
+        # side. Processes rather than threads: pynini does not reliably drop
+        # the GIL around OpenFst calls.
+        workers = min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(gen_fn): name for name, gen_fn in pending}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                    print(f"  ✓ {name}")
+                except Exception as e:
+                    print(f"  ✗ {name}: {e}", file=sys.stderr)
+    else:
+        # A fresh checkout gives the corpus and this script near-equal mtimes.
+        print("All cases up-to-date; pass --force to regenerate.")
     print("Done.")
 
 
@@ -11,7 +11,11 @@ Example:
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import os
 import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 
@@ -40,22 +44,78 @@ def parse_args() -> argparse.Namespace:
         "--include",
         nargs="*",
         default=("*_tagger.fst", "*_verbalizer.fst"),
-        help="Glob patterns to include (default: *_tagger.fst *_verbalizer.fst).",
+        help=(
+            "File-name patterns to include, matched in --input-dir only, no path "
+            "components (default: *_tagger.fst *_verbalizer.fst)."
+        ),
     )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Print planned conversions without executing.",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Convert even when the output is newer than its source.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Concurrent conversions (default: number of CPUs).",
+    )
     return parser.parse_args()
 
 
 def collect_inputs(input_dir: Path, patterns: list[str]) -> list[Path]:
+    # One directory pass for all patterns; DirEntry.is_file() reuses the
+    # readdir file type instead of stat-ing every entry per pattern.
     files: list[Path] = []
-    for pattern in patterns:
-        files.extend(input_dir.glob(pattern))
-    # de-duplicate and stable order
-    return sorted(set(f for f in files if f.is_file()))
+    with os.scandir(input_dir) as it:
+        for entry in it:
+            if entry.is_file() and any(fnmatch.fnmatchcase(entry.name, p) for p in patterns):
+                files.append(Path(entry.path))
+    # each entry is visited once, so only a stable order is needed
+    return sorted(files)
+
+
+def build_att2lfst(repo: Path) -> bool:
+    # Build once here: every convert_wetext_fst.sh would otherwise run its own
+    # `zig build att2lfst`, and the pooled jobs would serialize on zig's cache
+    # lock and race to install the same binary.
+    try:
+        subprocess.run(["zig", "build", "att2lfst"], cwd=repo, check=True)
+    except FileNotFoundError:
+        print("error: 'zig' not found in PATH.")
+        return False
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"error: failed to build att2lfst: {e}")
+        return False
+    return True
+
+
+def convert_one(converter: Path, src: Path, dst: Path) -> None:
+    # att2lfst writes its output in place, so a failed or interrupted run would
+    # leave a truncated dst newer than src that the up-to-date check then
+    # skips. Convert into a sibling temp file and publish it only on success.
+    tmp = dst.with_name(f"{dst.name}.tmp")
+    try:
+        result = subprocess.run(
+            [str(converter), str(src), str(tmp)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            env={**os.environ, "LIBFST_SKIP_ATT2LFST_BUILD": "1"},
+        )
+        # Forward the child's stderr (warnings or errors) in one write so
+        # concurrent conversions do not interleave mid-message.
+        if result.stderr:
+            sys.stderr.write(result.stderr)
+        result.check_returncode()
+        os.replace(tmp, dst)
+    finally:
+        tmp.unlink(missing_ok=True)
 
 
 def main() -> int:
@@ -71,6 +131,13 @@ def main() -> int:
     if not converter.is_file():
         print(f"error: converter script not found: {converter}")
         return 1
+    # collect_inputs matches entry names only; a path pattern would silently
+    # match nothing.
+    separators = {os.sep, "/"} | ({os.altsep} if os.altsep else set())
+    for pattern in args.include:
+        if "**" in pattern or any(sep in pattern for sep in separators):
+            print(f"error: --include takes file-name patterns without path components: {pattern}")
+            return 1
 
     candidates = collect_inputs(input_dir, list(args.include))
     if not candidates:
@@ -80,16 +147,37 @@ def main() -> int:
     output_dir.mkdir(parents=True, exist_ok=True)
     print(f"found {len(candidates)} file(s)")
 
+    suffix = args.suffix
+    plan: list[tuple[Path, Path]] = []
     for src in candidates:
-        stem = src.name[:-4] if src.name.endswith(".fst") else src.name
-        dst = output_dir / f"{stem}{args.suffix}"
-        print(f"{src} -> {dst}")
-        if args.dry_run:
+        stem = src.stem if src.suffix == ".fst" else src.name
+        dst = output_dir / f"{stem}{suffix}"
+        if not args.force and dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
+            print(f"skip {dst} (up-to-date)")
             continue
-        subprocess.run(
-            [str(converter), str(src), str(dst)],
-            check=True,
-        )
+        print(f"{src} -> {dst}")
+        plan.append((src, dst))
+
+    if plan and not args.dry_run:
+        if not build_att2lfst(converter.parent.parent):
+            return 1
+        # Each conversion is an independent child process; threads only wait.
+        # On the first failure, cancel queued work but let running conversions
+        # finish so their stderr is still forwarded.
+        failures: list[Exception] = []
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = [pool.submit(convert_one, converter, src, dst) for src, dst in plan]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                try:
+                    future.result()
+                except Exception as e:
+                    if not failures:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    failures.append(e)
+        if failures:
+            raise failures[0]
 
     print("done")
     return 0
@@ -11,7 +11,12 @@ Description:
 
 Requirements:
   - fstprint (OpenFst CLI)
-  - zig (to run the att2lfst converter)
+  - zig (to build the att2lfst converter)
+
+Environment:
+  LIBFST_SKIP_ATT2LFST_BUILD=1  use the existing zig-out/bin/att2lfst instead of
+                                running `zig build att2lfst` (batch callers
+                                build it once up front)
 EOF
 }
 
@@ -25,7 +30,9 @@ if ! command -v fstprint >/dev/null 2>&1; then
   exit 1
 fi
 
-if ! command -v zig >/dev/null 2>&1; then
+skip_build="${LIBFST_SKIP_ATT2LFST_BUILD:-}"
+
+if [[ -z "$skip_build" ]] && ! command -v zig >/dev/null 2>&1; then
   echo "error: 'zig' not found in PATH." >&2
   exit 1
 fi
@@ -44,7 +51,9 @@ trap 'rm -f "$tmp_att"' EXIT
 
 fstprint "$input_fst" > "$tmp_att"
 
-zig build --build-file "$repo_root/build.zig" att2lfst
+if [[ -z "$skip_build" ]]; then
+  zig build --build-file "$repo_root/build.zig" att2lfst
+fi
 "$repo_root/zig-out/bin/att2lfst" \
   --input "$tmp_att" \
   --output "$output_fst"